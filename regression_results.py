@@ -18,14 +18,25 @@ from __future__ import annotations
 import argparse
 import datetime as dt
 import difflib
+import gzip
+import itertools
 import json
+import multiprocessing
+import os
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DEFAULT_BASELINE_DIR = Path(".regression/baseline")
 DEFAULT_COMPARISON_DIR = Path(".regression/comparison")
+RESULTS_FILENAMES = ("results.json", "results.json.gz")
 
 SUPPORTED_DICT_KEYS = {
     "whodrug",
@@ -108,7 +119,7 @@ def _total_errors(payload: Dict[str, Any]) -> int:
 
 def _execute_case(runner: Any, rule_id: str, test_type: str, case_info: Dict[str, str]) -> Dict[str, Any]:
     """Run one test case and return a results.json payload (without writing to rules/)."""
-    _, results_data = runner.run_validation(rule_id, case_info)
+    _, results_data, _ = runner.run_validation(rule_id, case_info)
 
     if results_data is None:
         results_data = {"error": "Unknown Error", "exception": "Engine returned None"}
@@ -144,8 +155,9 @@ def run_isolated_suite(
     use_postgres: bool,
     dictionary_paths_file: Optional[Path],
     clean: bool,
+    compress: bool = False,
 ) -> Dict[str, Any]:
-    """Run all cases and write results.json outputs under output_dir/rules/ only."""
+    """Run all cases and write results.json (results.json.gz with compress) outputs under output_dir/rules/ only."""
 
     dictionary_paths = load_dictionary_paths(dictionary_paths_file)
 
@@ -172,28 +184,29 @@ def run_isolated_suite(
 
         for index, rule_id in enumerate(rules, start=1):
             print(f"[{index}/{len(rules)}] Running {rule_id}")
-            rule_cases = runner.get_test_cases(rule_id)
 
-            for test_type in ("positive", "negative"):
-                for case_info in rule_cases[test_type]:
-                    case_id = case_info["case_id"]
-                    payload = _execute_case(runner, rule_id, test_type, case_info)
+            for test_type, case_info in runner.iter_test_cases(rule_id):
+                case_id = case_info["case_id"]
+                payload = _execute_case(runner, rule_id, test_type, case_info)
 
-                    out_results_dir = output_dir / "rules" / rule_id / test_type / case_id / "results"
-                    out_results_dir.mkdir(parents=True, exist_ok=True)
+                out_results_dir = output_dir / "rules" / rule_id / test_type / case_id / "results"
+                out_results_dir.mkdir(parents=True, exist_ok=True)
 
+                if compress:
+                    # Level 3 keeps compression close to write speed; the repetitive JSON still shrinks several-fold.
+                    with gzip.open(out_results_dir / "results.json.gz", "wt", encoding="utf-8", compresslevel=3) as f:
+                        json.dump(payload, f, indent=2, sort_keys=True)
+                    (out_results_dir / "results.json").unlink(missing_ok=True)
+                else:
                     with (out_results_dir / "results.json").open("w", encoding="utf-8") as f:
                         json.dump(payload, f, indent=2, sort_keys=True)
+                    (out_results_dir / "results.json.gz").unlink(missing_ok=True)
 
-                    summary["total_cases"] += 1
-                    if "error" in payload:
-                        summary["cases_with_execution_error"] += 1
+                summary["total_cases"] += 1
+                if "error" in payload:
+                    summary["cases_with_execution_error"] += 1
     finally:
-        # Best effort cleanup of DB connection used by the shared data service singleton.
-        try:
-            runner.data_service.pgi.close()
-        except Exception:
-            pass
+        runner.close()
 
     with (output_dir / "baseline_run_summary.json").open("w", encoding="utf-8") as f:
         json.dump(summary, f, indent=2, sort_keys=True)
@@ -209,7 +222,7 @@ def run_isolated_suite(
 
 
 def _extract_case_key(path: Path, root: Path) -> Optional[str]:
-    """Extract case key as RULE/TYPE/CASE from a results.json path."""
+    """Extract case key as RULE/TYPE/CASE from a results.json or results.json.gz path."""
     try:
         rel_parts = list(path.relative_to(root).parts)
     except ValueError:
@@ -218,7 +231,7 @@ def _extract_case_key(path: Path, root: Path) -> Optional[str]:
     if len(rel_parts) < 5:
         return None
 
-    if rel_parts[-2:] != ["results", "results.json"]:
+    if rel_parts[-2] != "results" or rel_parts[-1] not in RESULTS_FILENAMES:
         return None
 
     # Accept roots that are either:
@@ -256,22 +269,53 @@ def is_rule_verified(rule_id: str) -> bool:
 
 
 def collect_results(root: Path) -> Dict[str, Dict[str, Any]]:
-    """Load case-level results.json files from a root directory."""
+    """Load case-level results.json (or gzipped results.json.gz) files from a root directory."""
     output: Dict[str, Dict[str, Any]] = {}
     if not root.exists():
         return output
 
-    for path in sorted(root.rglob("results.json")):
+    keyed_paths = []
+    results_dirs: Dict[Path, Path] = {}
+    for path in sorted(p for name in RESULTS_FILENAMES for p in root.rglob(name)):
         case_key = _extract_case_key(path, root)
-        if not case_key:
-            continue
+        if case_key:
+            # A results folder holding both formats is ambiguous: which one is stale depends on how it was written.
+            if path.parent in results_dirs:
+                raise ValueError(
+                    f"Both {results_dirs[path.parent].name} and {path.name} found in {path.parent}; remove the stale one"
+                )
+            results_dirs[path.parent] = path
+            keyed_paths.append((case_key, path))
 
-        with path.open("r", encoding="utf-8") as f:
-            output[case_key] = json.load(f)
+    if keyed_paths:
+        # File reads release the GIL, so on a cold cache the threads overlap I/O; results are merged in path order.
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(keyed_paths))) as executor:
+            payloads = executor.map(_load_json, [path for _, path in keyed_paths])
+            for (case_key, _), payload in zip(keyed_paths, payloads):
+                output[case_key] = payload
 
     return output
 
 
+def _load_json(path: Path) -> Any:
+    """Load a results.json or results.json.gz file, parsing with orjson when it is installed."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        raw = f.read()
+
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals written by json.dump, which only the stdlib parser accepts
+    return json.loads(raw)
+
+
+# Sort key for normalized list items. json.dumps(item, sort_keys=True) builds a new encoder on every call; this one is
+# built once and produces the same strings. Normalized payloads are trees, so the circular-reference check is skipped.
+_canonical_json = json.JSONEncoder(sort_keys=True, check_circular=False).encode
+
+
 def _normalize_for_compare(value: Any) -> Any:
     """Normalize JSON while keeping validated fields and ignoring dictionary_versions."""
     if isinstance(value, dict):
@@ -284,7 +328,7 @@ def _normalize_for_compare(value: Any) -> Any:
 
     if isinstance(value, list):
         normalized_list = [_normalize_for_compare(item) for item in value]
-        return sorted(normalized_list, key=lambda item: json.dumps(item, sort_keys=True))
+        return sorted(normalized_list, key=_canonical_json)
 
     return value
 
@@ -311,13 +355,24 @@ def _normalize_for_trivial_compare(value: Any) -> Any:
 
     if isinstance(value, list):
         normalized_list = [_normalize_for_trivial_compare(item) for item in value]
-        return sorted(normalized_list, key=lambda item: json.dumps(item, sort_keys=True))
+        return sorted(normalized_list, key=_canonical_json)
 
     return value
 
 
-def compare_case(old_payload: Dict[str, Any], new_payload: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
-    """Compare two case payloads and return changed flag plus details."""
+def compare_case(
+    old_payload: Dict[str, Any],
+    new_payload: Dict[str, Any],
+    max_diff_lines: Optional[int] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """Compare two case payloads and return changed flag plus details.
+
+    With max_diff_lines, the unified diff is cut off one line past the limit, enough for callers to see it was truncated.
+    """
+    # Most cases are unchanged between runs; identical payloads are settled by one dict comparison, without normalizing.
+    if old_payload == new_payload:
+        return False, {}
+
     old_n = _normalize_for_compare(old_payload)
     new_n = _normalize_for_compare(new_payload)
 
@@ -326,7 +381,8 @@ def compare_case(old_payload: Dict[str, Any], new_payload: Dict[str, Any]) -> Tu
 
     old_text = json.dumps(old_n, indent=2, sort_keys=True).splitlines()
     new_text = json.dumps(new_n, indent=2, sort_keys=True).splitlines()
-    unified = list(difflib.unified_diff(old_text, new_text, fromfile="baseline", tofile="current", lineterm=""))
+    diff = difflib.unified_diff(old_text, new_text, fromfile="baseline", tofile="current", lineterm="")
+    unified = list(diff if max_diff_lines is None else itertools.islice(diff, max_diff_lines + 1))
 
     # Trivial if the only material difference is row-position metadata or execution message text.
     old_row_agnostic = _normalize_for_trivial_compare(old_payload)
@@ -351,20 +407,23 @@ def write_diff_summary(
     current_results: Dict[str, Dict[str, Any]],
     max_diff_lines: int,
     verified_only: bool = False,
+    jobs: int = 1,
 ) -> Dict[str, Any]:
     """Write a readable markdown diff summary and return top-level stats.
 
     When verified_only=True, only cases whose rule_id has a '# verified' comment
-    at the top of its YAML are included.
+    at the top of its YAML are included. With jobs > 1, cases whose payloads
+    differ are diffed in that many worker processes.
     """
     if verified_only:
+        # Each rule's YAML is checked once, rather than once for every case key that belongs to it.
         all_keys = baseline_results.keys() | current_results.keys()
-        verified_rules = {k for k in all_keys if is_rule_verified(k.split("/")[0])}
-        baseline_results = {k: v for k, v in baseline_results.items() if k in verified_rules}
-        current_results = {k: v for k, v in current_results.items() if k in verified_rules}
+        verified_rules = {rule_id for rule_id in {k.split("/")[0] for k in all_keys} if is_rule_verified(rule_id)}
+        baseline_results = {k: v for k, v in baseline_results.items() if k.split("/")[0] in verified_rules}
+        current_results = {k: v for k, v in current_results.items() if k.split("/")[0] in verified_rules}
 
-    baseline_keys = set(baseline_results.keys())
-    current_keys = set(current_results.keys())
+    baseline_keys = baseline_results.keys()
+    current_keys = current_results.keys()
 
     added_cases = sorted(current_keys - baseline_keys)
     removed_cases = sorted(baseline_keys - current_keys)
@@ -372,10 +431,25 @@ def write_diff_summary(
 
     changed_cases: List[Tuple[str, Dict[str, Any]]] = []
     trivial_diff_cases: List[Tuple[str, Dict[str, Any]]] = []
-    unchanged_cases = 0
 
-    for case_key in common_cases:
-        changed, details = compare_case(baseline_results[case_key], current_results[case_key])
+    # Identical payloads are settled here; only the rest are worth the normalizing and diffing, and the trip to a worker.
+    differing = [k for k in common_cases if baseline_results[k] != current_results[k]]
+    unchanged_cases = len(common_cases) - len(differing)
+    old_payloads = [baseline_results[k] for k in differing]
+    new_payloads = [current_results[k] for k in differing]
+
+    if jobs > 1 and len(differing) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(differing)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            outcomes = list(
+                executor.map(compare_case, old_payloads, new_payloads, itertools.repeat(max_diff_lines), chunksize=8)
+            )
+    else:
+        outcomes = map(compare_case, old_payloads, new_payloads, itertools.repeat(max_diff_lines))
+
+    for case_key, (changed, details) in zip(differing, outcomes):
         if changed:
             if details.get("is_trivial"):
                 trivial_diff_cases.append((case_key, details))
@@ -507,6 +581,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Delete baseline-dir before writing new outputs",
     )
+    snapshot.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write results.json.gz instead of results.json to shrink the baseline",
+    )
 
     compare = subparsers.add_parser(
         "compare",
@@ -535,6 +614,7 @@ def parse_args() -> argparse.Namespace:
         default=120,
         help="Maximum unified diff lines shown per changed case",
     )
+    compare.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes used to diff changed cases")
     compare.add_argument(
         "--clean",
         action="store_true",
@@ -553,6 +633,7 @@ def main() -> int:
             use_postgres=args.use_postgres,
             dictionary_paths_file=args.dictionary_paths_file,
             clean=args.clean,
+            compress=args.gzip,
         )
         print(f"Baseline created at: {args.baseline_dir}")
         print("No files were written to rules/*/results by this command.")
@@ -594,6 +675,7 @@ def main() -> int:
                 baseline_results=baseline_results,
                 current_results=current_results_snapshot,
                 max_diff_lines=args.max_diff_lines,
+                jobs=args.jobs,
             )
             write_diff_summary(
                 summary_path=verified_summary_file,
@@ -603,6 +685,7 @@ def main() -> int:
                 current_results=current_results_snapshot,
                 max_diff_lines=args.max_diff_lines,
                 verified_only=True,
+                jobs=args.jobs,
             )
 
             print(f"Summary written: {summary_file}")
@@ -650,6 +733,7 @@ def main() -> int:
         baseline_results=baseline_results,
         current_results=current_results,
         max_diff_lines=args.max_diff_lines,
+        jobs=args.jobs,
     )
     write_diff_summary(
         summary_path=verified_summary_file,
@@ -659,6 +743,7 @@ def main() -> int:
         current_results=current_results,
         max_diff_lines=args.max_diff_lines,
         verified_only=True,
+        jobs=args.jobs,
     )
 
     print(f"Summary written: {summary_file}")
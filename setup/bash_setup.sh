@@ -143,6 +143,11 @@ else
     pip install -r engine/requirements-dev.txt --quiet
 fi
 
+# Optional fast xlsx reader used by tests/formatter.py's label scan
+pip install "python-calamine>=0.2" --quiet
+# Optional fast JSON encoder/decoder used by test.py and regression_results.py for results.json
+pip install "orjson>=3.6" --quiet
+
 VENV_PYTHON=$(which python)
 
 echo "Setup completed successfully!"
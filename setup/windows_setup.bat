@@ -113,6 +113,10 @@ echo Installing dependencies...
 venv\Scripts\python.exe -m pip install --upgrade pip setuptools wheel --quiet
 venv\Scripts\python.exe -m pip install -r engine\requirements.txt --quiet
 venv\Scripts\python.exe -m pip install -r engine\requirements-dev.txt --quiet
+REM Optional fast xlsx reader used by tests/formatter.py's label scan
+venv\Scripts\python.exe -m pip install "python-calamine>=0.2" --quiet
+REM Optional fast JSON encoder/decoder used by test.py and regression_results.py for results.json
+venv\Scripts\python.exe -m pip install "orjson>=3.6" --quiet
 
 echo.
 echo Setup completed successfully! [cite: 11]
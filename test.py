@@ -3,18 +3,27 @@
 Contributor test script for SQL CDISC Rules Engine Contributor Repo.
 """
 
+import os
 import sys
 import argparse
 import json
 import logging
 import warnings
-import textwrap
 import csv
+import copy
+import functools
+import math
 import pandas as pd
 import openpyxl as op
 from glob import glob
 from pathlib import Path
-from typing import List, Optional, Tuple, Any, Dict
+from types import SimpleNamespace
+from typing import List, Optional, Tuple, Any, Dict, NamedTuple, Sequence, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 logging.basicConfig(level=logging.CRITICAL)
@@ -23,82 +32,160 @@ SDTM_RULES_DIR = Path("rules")
 ADAM_RULES_DIR = Path("adam_rules")
 ENGINE_DIR = Path("engine")
 
+SUMMARY_RULE = "=" * 60
+SUMMARY_SUBRULE = "-" * 54
+SUMMARY_HEADER = "\n{}\n{} Test Results Summary"
+VERBOSE_INDENT = "     "
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+REPORT_SKIPPED_KEYS = frozenset({"row", "value", "validated"})
+
+VALIDATION_COLUMNS = ("Sheet", "Error level", "Row num", "Variable", "Error value")
+
+
+def find_files(directory: Path, *extensions: str) -> List[Path]:
+    """Lists files in a directory with one of the given extensions in a single scandir pass, skipping Office lock files."""
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if not entry.name.startswith("~") and os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def count_errors(results_data: dict) -> int:
+    return sum(len(ds.get("errors", [])) for ds in results_data.get("datasets", []))
+
+
+@functools.lru_cache(maxsize=None)
+def _engine_api() -> SimpleNamespace:
+    """Imports the engine entry points used for every case once. Needs the engine path and env set up by TestRunner."""
+    from engine.cdisc_rules_engine.services.define_xml.define_xml_reader_factory import DefineXMLReaderFactory
+    from engine.tests.rule_regression.regression import (
+        TestDataset, VariableMetadata, process_test_case_dataset_sql, sharepoint_xlsx_to_test_datasets,
+    )
+
+    return SimpleNamespace(
+        DefineXMLReaderFactory=DefineXMLReaderFactory, TestDataset=TestDataset, VariableMetadata=VariableMetadata,
+        process_test_case_dataset_sql=process_test_case_dataset_sql, sharepoint_xlsx_to_test_datasets=sharepoint_xlsx_to_test_datasets,
+    )
+
+
+class ValidationRow(NamedTuple):
+    """A Validation sheet entry, reduced to the columns the checks read."""
+
+    sheet: Any
+    error_level: Any
+    row_num: Any
+    variable: Any
+    error_value: Any
+
 
 class ResultReporter:
     """Handles formatting, printing, and saving of test results."""
 
     @classmethod
-    def json_to_readable(cls, results_data: dict, output_path: Path):
+    def _dump_json(cls, output: Dict) -> bytes:
+        """Serialises results with orjson when installed; non-string keys (e.g. a None sheet) are stringified as json does."""
+        # orjson writes NaN/Infinity as null and rejects float subclasses (e.g. numpy.float64) and ints wider than
+        # 64 bits; json handles all three, so those payloads take the json path instead.
+        if orjson is not None and not cls._has_non_finite(output):
+            try:
+                return orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except (TypeError, orjson.JSONEncodeError):
+                pass
+        return json.dumps(output, indent=2).encode("utf-8")
+
+    @classmethod
+    def _has_non_finite(cls, value: Any) -> bool:
+        if isinstance(value, float):
+            return not math.isfinite(value)
+        if isinstance(value, dict):
+            return any(cls._has_non_finite(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return any(cls._has_non_finite(v) for v in value)
+        return False
+
+    @classmethod
+    def json_to_readable(cls, results_data: dict, output_path: Path, total_errors: Optional[int] = None):
         """Write a human-readable summary of the JSON results to a text file."""
-        with output_path.open("w") as f:
-            if "error" in results_data:
-                f.write("EXECUTION ERROR\n===============\n")
-                f.write(f"{results_data['error']}\n")
-                if "exception" in results_data:
-                    f.write(f"Details: {results_data['exception']}\n")
-                return
-
-            datasets = results_data.get("datasets", [])
-            if not datasets:
-                f.write("No validation results found.\n")
-                return
-
-            total_errors = sum(len(ds.get("errors", [])) for ds in datasets)
-            f.write(f"Total Errors Found: {total_errors}\n\n")
-
-            for dataset in datasets:
-                f.write(f"Dataset: {dataset.get('dataset', 'Unknown')}\n")
-                f.write(f"Domain: {dataset.get('domain', 'N/A')}\n")
-                if msg := dataset.get("execution_message"):
-                    f.write(f"Rule Message: {msg}\n")
-
-                errors = dataset.get("errors", [])
-                f.write(f"Errors in this dataset: {len(errors)}\n")
-
-                if not errors:
-                    f.write("  No errors found in this dataset.\n")
-                else:
-                    f.write("\n")
-                    for i, error in enumerate(errors, 1):
-                        f.write(f"  Error {i}:\n")
-                        if row := error.get("row"):
-                            f.write(f"    Row: {row}\n")
-
-                        for key, val in error.items():
-                            if key not in ["row", "value", "validated"]:
-                                f.write(f"    {key}: {val}\n")
-
-                        if error.get("validated") is not None:
-                            validation = "Yes" if error["validated"] else "No"
-                            f.write(f"    Fully Validated in Test Case: {validation}\n")
-                        f.write("\n")
-                f.write("\n")
-
-            if any(
-                [
-                    results_data.get("validated"),
-                    results_data.get("unhighlighted_validations"),
-                    results_data.get("unvalidated_highlights"),
-                ]
-            ):
-                f.write("***ISSUES***\n")
-
-            if results_data.get("validated") or results_data.get("unmatched_validation"):
-                f.write("Mismatch between validation sheet and engine errors\n")
-                f.write("Check results.json for more information, or examine the test case file directly.\n")
-
-            if uh_v := results_data.get("unhighlighted_validations"):
-                f.write("The following error groups on the validations sheet are not highlighted correctly:\n")
-                f.write(", ".join(str(v) for e in uh_v for v in e.values()) + "\n")
-
-            if uv_h := results_data.get("unvalidated_highlights"):
-                f.write("The following rows have highlights that do not match the validations sheet:\n")
-                ids = [f"{k}: {v}" for e in uv_h for k, v in e.items()]
-                f.write("\n".join(", ".join(ids[i : i + 2]) for i in range(0, len(ids), 2)))
+        output_path.write_text(cls._build_text(results_data, total_errors))
+
+    @staticmethod
+    def _build_text(results_data: dict, total_errors: Optional[int] = None) -> str:
+        """Render the human-readable summary of the JSON results."""
+        parts: List[str] = []
+        if "error" in results_data:
+            parts.append("EXECUTION ERROR\n===============\n")
+            parts.append(f"{results_data['error']}\n")
+            if "exception" in results_data:
+                parts.append(f"Details: {results_data['exception']}\n")
+            return "".join(parts)
+
+        datasets = results_data.get("datasets", [])
+        if not datasets:
+            return "No validation results found.\n"
+
+        if total_errors is None:
+            total_errors = count_errors(results_data)
+        parts.append(f"Total Errors Found: {total_errors}\n\n")
+
+        for dataset in datasets:
+            parts.append(f"Dataset: {dataset.get('dataset', 'Unknown')}\n")
+            parts.append(f"Domain: {dataset.get('domain', 'N/A')}\n")
+            if msg := dataset.get("execution_message"):
+                parts.append(f"Rule Message: {msg}\n")
+
+            errors = dataset.get("errors", [])
+            parts.append(f"Errors in this dataset: {len(errors)}\n")
+
+            if not errors:
+                parts.append("  No errors found in this dataset.\n")
+            else:
+                parts.append("\n")
+                for i, error in enumerate(errors, 1):
+                    parts.append(f"  Error {i}:\n")
+                    if row := error.get("row"):
+                        parts.append(f"    Row: {row}\n")
+
+                    parts.extend(f"    {key}: {val}\n" for key, val in error.items() if key not in REPORT_SKIPPED_KEYS)
+
+                    if error.get("validated") is not None:
+                        validation = "Yes" if error["validated"] else "No"
+                        parts.append(f"    Fully Validated in Test Case: {validation}\n")
+                    parts.append("\n")
+            parts.append("\n")
+
+        if any(
+            [
+                results_data.get("validated"),
+                results_data.get("unhighlighted_validations"),
+                results_data.get("unvalidated_highlights"),
+            ]
+        ):
+            parts.append("***ISSUES***\n")
+
+        if results_data.get("validated") or results_data.get("unmatched_validation"):
+            parts.append("Mismatch between validation sheet and engine errors\n")
+            parts.append("Check results.json for more information, or examine the test case file directly.\n")
+
+        if uh_v := results_data.get("unhighlighted_validations"):
+            parts.append("The following error groups on the validations sheet are not highlighted correctly:\n")
+            parts.append(", ".join(str(v) for e in uh_v for v in e.values()) + "\n")
+
+        if uv_h := results_data.get("unvalidated_highlights"):
+            parts.append("The following rows have highlights that do not match the validations sheet:\n")
+            ids = [f"{k}: {v}" for e in uv_h for k, v in e.items()]
+            parts.append("\n".join(", ".join(ids[i : i + 2]) for i in range(0, len(ids), 2)))
+
+        return "".join(parts)
 
     @classmethod
     def save_case_results(
-        cls, rules_dir: str, rule_id: str, test_type: str, case_id: str, results: dict, version_info: Optional[dict] = None
+        cls, rules_dir: str, rule_id: str, test_type: str, case_id: str, results: dict, version_info: Optional[dict] = None,
+        total_errors: Optional[int] = None,
     ):
         """Saves JSON and TXT results to the file system."""
         base_rule_path = Path(rules_dir)
@@ -121,22 +208,21 @@ class ResultReporter:
         results_path.mkdir(parents=True, exist_ok=True)
 
         output = {**results, "dictionary_versions": version_info} if version_info else results
-        with (results_path / "results.json").open("w") as f:
-            json.dump(output, f, indent=2)
-
-        cls.json_to_readable(results, results_path / "results.txt")
+        # Both files are rendered in memory and written with one call each; json.dump would issue a write per chunk.
+        (results_path / "results.json").write_bytes(cls._dump_json(output))
+        cls.json_to_readable(results, results_path / "results.txt", total_errors)
         return str(results_path)
 
     @staticmethod
     def display_rule_summary(summary: dict, verbose: bool = False):
         """Prints the execution summary for a single rule to the console."""
-        print(f"\n{'='*60}\n{summary['rule_id']} Test Results Summary")
+        print(SUMMARY_HEADER.format(SUMMARY_RULE, summary["rule_id"]))
         print(f"\nRule: {summary['rule_id']}")
         print(f"Overall Status: {summary['status'].upper()}")
 
         for test_type in ["positive", "negative"]:
             tests = summary[f"{test_type}_tests"]
-            print(f"{'-'*54}")
+            print(SUMMARY_SUBRULE)
             print(f"{test_type.capitalize()} Test Cases: {len(tests)}")
             for test in tests:
                 symbol = "[OMIT]" if test.get("omitted") else "[PASS]" if test["passed"] else "[FAIL]"
@@ -145,7 +231,7 @@ class ResultReporter:
                 if verbose:
                     txt_path = Path(test["results_path"]) / "results.txt"
                     if txt_path.exists():
-                        print(f"\n{textwrap.indent(txt_path.read_text().strip(), "     ")}")
+                        print("\n" + VERBOSE_INDENT + txt_path.read_text().strip().replace("\n", "\n" + VERBOSE_INDENT))
 
                 if not test["passed"] and not verbose:
                     print(f"      Expected: {test['expected']}")
@@ -155,7 +241,7 @@ class ResultReporter:
                         print(f"      Error: {test['error']}")
                         print(f"      Exception: {test.get('exception', 'N/A')}")
 
-        print("\n" + "=" * 60)
+        print("\n" + SUMMARY_RULE)
 
 
 class TestRunner:
@@ -178,6 +264,8 @@ class TestRunner:
         load_dotenv("engine/.env.example")
         self._setup_engine_path()
         self.use_pgserver = use_pgserver
+        self._rule_cache: Dict[str, Tuple[tuple, dict]] = {}
+        self._test_case_cache: Dict[str, Tuple[tuple, dict]] = {}
         self.standard = standard
         self.rules_dir = None
         if standard == "sdtm":
@@ -256,14 +344,15 @@ class TestRunner:
         if not self.rules_dir.exists():
             return None
             
+        # is_dir() is False for a missing path, so it covers the existence check with a single stat.
         standalone_path = self.rules_dir / rule_id
-        if standalone_path.exists() and standalone_path.is_dir():
+        if standalone_path.is_dir():
             return standalone_path
             
         for d in self.rules_dir.iterdir():
             if d.is_dir():
                 bundled_path = d / rule_id
-                if bundled_path.exists() and bundled_path.is_dir():
+                if bundled_path.is_dir():
                     return bundled_path
                     
         return None
@@ -278,11 +367,11 @@ class TestRunner:
                 continue
             
             if (d.name.startswith("CORE-") or d.name.startswith("AD") or d.name.startswith("NEW-RULE")):
-                if list(d.glob("[!~]*.yml")):
+                if find_files(d, ".yml"):
                     rules.append(d.name)
                 else:
                     for subd in d.iterdir():
-                        if subd.is_dir() and list(subd.glob("[!~]*.yml")):
+                        if subd.is_dir() and find_files(subd, ".yml"):
                             rules.append(subd.name)
                             
         return sorted(rules)
@@ -290,15 +379,27 @@ class TestRunner:
     def get_test_cases(self, rule_id: str) -> dict:
         """Scans directories to find available test cases for a rule."""
         cases = {"positive": [], "negative": []}
-        rule_path = self.get_rule_path(rule_id)
-        
-        if not rule_path:
+        test_source = self._test_source(rule_id)
+        if not test_source:
             return cases
 
-        parent_dir = rule_path.parent
-        shared_cases_path = parent_dir / "shared_test_cases"
-        
-        test_source = shared_cases_path if shared_cases_path.exists() else rule_path
+        # Adding or removing a case directory bumps its parent's mtime, which is enough to invalidate a cached scan.
+        stamp = tuple(self._mtime_ns(test_source / test_type) for test_type in ["positive", "negative"])
+        cached = self._test_case_cache.get(rule_id)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        for test_type, case in self.iter_test_cases(rule_id):
+            cases[test_type].append(case)
+
+        self._test_case_cache[rule_id] = (stamp, cases)
+        return cases
+
+    def iter_test_cases(self, rule_id: str) -> Iterator[Tuple[str, dict]]:
+        """Yields (test_type, case) pairs as the case directories are scanned, positive cases first."""
+        test_source = self._test_source(rule_id)
+        if not test_source:
+            return
 
         for test_type in ["positive", "negative"]:
             test_type_path = test_source / test_type
@@ -309,15 +410,30 @@ class TestRunner:
                         if not data_dir.exists():
                             data_dir = case_dir
                             
-                        has_csv = list(data_dir.glob("*.csv"))
-                        has_xlsx = list(data_dir.glob("[!~]*.xls*"))
-                        
+                        data_files = find_files(data_dir, ".csv", *EXCEL_EXTENSIONS)
+                        has_csv = any(p.suffix.lower() == ".csv" for p in data_files)
+                        has_xlsx = not has_csv and bool(data_files)
+
                         if has_csv:
-                            cases[test_type].append({"case_id": case_dir.name, "data_path": str(data_dir), "format": "csv"})
+                            yield test_type, {"case_id": case_dir.name, "data_path": str(data_dir), "format": "csv"}
                         elif has_xlsx:
-                            cases[test_type].append({"case_id": case_dir.name, "data_path": str(data_dir), "format": "xlsx"})
-                            
-        return cases
+                            yield test_type, {"case_id": case_dir.name, "data_path": str(data_dir), "format": "xlsx"}
+
+    def _test_source(self, rule_id: str) -> Optional[Path]:
+        """Bundled rules keep their cases in a shared_test_cases folder beside the rule."""
+        rule_path = self.get_rule_path(rule_id)
+        if not rule_path:
+            return None
+
+        shared_cases_path = rule_path.parent / "shared_test_cases"
+        return shared_cases_path if shared_cases_path.exists() else rule_path
+
+    @staticmethod
+    def _mtime_ns(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
 
     @staticmethod
     def _read_library_specs_csv(data_path: str) -> Tuple[str, str, List[str]]:
@@ -341,7 +457,7 @@ class TestRunner:
 
     @staticmethod
     def _read_library_specs_xlsx(excel_path: str) -> Tuple[str, str, List[str]]:
-        wb = op.load_workbook(excel_path, data_only=True, read_only=True)
+        wb = op.load_workbook(excel_path, data_only=True, read_only=True, keep_links=False)
         try:
             if "Library" not in wb.sheetnames:
                 raise ValueError(f"Sheet 'Library' not found in {excel_path}")
@@ -356,7 +472,7 @@ class TestRunner:
             wb.close()
 
     def _load_csv_datasets(self, data_path: str) -> list:
-        from engine.tests.rule_regression.regression import TestDataset, VariableMetadata
+        engine = _engine_api()
         datasets_csv_path = Path(data_path) / "_datasets.csv"
         datasets_df = pd.read_csv(datasets_csv_path)
         test_datasets = []
@@ -374,7 +490,7 @@ class TestRunner:
                 for i, col in enumerate(dataset_df.columns):
                     if col.startswith("Unnamed:"): continue
                     var_type = str(dataset_df[col].iloc[1])
-                    variables.append(VariableMetadata(name=col, label=str(dataset_df[col].iloc[0]), type=var_type, length=dataset_df[col].iloc[2], format="", order=i + 1))
+                    variables.append(engine.VariableMetadata(name=col, label=str(dataset_df[col].iloc[0]), type=var_type, length=dataset_df[col].iloc[2], format="", order=i + 1))
                     col_type_dict[col] = var_type
 
                 data = {}
@@ -387,10 +503,11 @@ class TestRunner:
                         column_values = ["" if pd.isna(val) else str(val) for val in column_values]
                     data[col] = column_values
 
-                test_datasets.append(TestDataset(filename=filename, name=filename.split(".")[0].upper(), label=label, variables=variables, records=data))
+                test_datasets.append(engine.TestDataset(filename=filename, name=filename.split(".")[0].upper(), label=label, variables=variables, records=data))
         return test_datasets
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _init_engine_specs(standard: str, standard_version: str):
         try:
             from engine.cdisc_rules_engine.utilities.ig_specification import IGSpecification
@@ -399,14 +516,14 @@ class TestRunner:
             print("Error: Could not import engine modules. Is the submodule initialised?")
             sys.exit(1)
 
-    def run_validation(self, rule_id: str, case_info: dict) -> Tuple[Any, Optional[dict]]:
+    def run_validation(self, rule_id: str, case_info: dict) -> Tuple[Any, Optional[dict], int]:
         rule_path = self.get_rule_path(rule_id)
         if not rule_path:
-            return None, {"error": "Rule path missing", "exception": f"Could not find path for rule {rule_id}"}
+            return None, {"error": "Rule path missing", "exception": f"Could not find path for rule {rule_id}"}, 0
         
-        rule_ymls = list(rule_path.glob("[!~]*.yml"))
+        rule_ymls = find_files(rule_path, ".yml")
         if not rule_ymls:
-            return None, {"error": "Rule YAML missing", "exception": f"No YAML found in {rule_path}"}
+            return None, {"error": "Rule YAML missing", "exception": f"No YAML found in {rule_path}"}, 0
         
         data_path_obj = Path(case_info["data_path"])
         is_csv = case_info["format"] == "csv"
@@ -417,39 +534,49 @@ class TestRunner:
                 define_xml_path = file_path
                 self.data_service._update_define_xml_path(define_xml_path)
                 if define_xml_path:
-                    from engine.cdisc_rules_engine.services.define_xml.define_xml_reader_factory import DefineXMLReaderFactory
-                    extensible_terms = DefineXMLReaderFactory.from_filename(define_xml_path).get_extensible_codelist_mappings()
+                    extensible_terms = _engine_api().DefineXMLReaderFactory.from_filename(define_xml_path).get_extensible_codelist_mappings()
                     self.data_service._add_extensible_ct_terms(extensible_terms)
             elif file == "stf.xml":
                 self.data_service._update_stf_file_path(file_path)
 
         try:
-            import yaml
-            from engine.tests.rule_regression.regression import process_test_case_dataset_sql, sharepoint_xlsx_to_test_datasets
-
-            with open(rule_ymls[0], "r", encoding="utf-8") as f:
-                rule = yaml.safe_load(f)
+            engine = _engine_api()
+            rule = self._load_rule(rule_id, rule_ymls[0])
 
             if is_csv:
                 standard, standard_version, provided_codelists = self._read_library_specs_csv(str(data_path_obj))
                 test_datasets = self._load_csv_datasets(str(data_path_obj))
             else:
-                excel_file = (list(data_path_obj.glob("[!~]*.xlsx")) + list(data_path_obj.glob("[!~]*.xls")))[0]
+                excel_files = find_files(data_path_obj, *EXCEL_EXTENSIONS)
+                excel_file = next((p for p in excel_files if p.suffix.lower() == ".xlsx"), excel_files[0])
                 standard, standard_version, provided_codelists = self._read_library_specs_xlsx(str(excel_file))
-                test_datasets = sharepoint_xlsx_to_test_datasets(str(excel_file))
+                test_datasets = engine.sharepoint_xlsx_to_test_datasets(str(excel_file))
 
             ig_specs = self._init_engine_specs(standard, standard_version)
             if provided_codelists:
                 self.data_service._update_provided_codelists(provided_codelists)
 
-            sql_results, sql_regression = process_test_case_dataset_sql(
+            sql_results, sql_regression = engine.process_test_case_dataset_sql(
                 regression_errors={}, define_xml_file_path=define_xml_path, data_test_datasets=test_datasets,
                 ig_specs=ig_specs, rule=rule, use_pgserver=self.use_pgserver, data_service=self.data_service
             )
 
-            return sql_results, {"datasets": sql_regression} if sql_regression else {"datasets": []}
+            results_data = {"datasets": sql_regression} if sql_regression else {"datasets": []}
+            return sql_results, results_data, count_errors(results_data)
         except Exception as e:
-            return None, {"error": "Error executing engine validation.", "exception": str(e)}
+            return None, {"error": "Error executing engine validation.", "exception": str(e)}, 0
+
+    def _load_rule(self, rule_id: str, rule_yml: Path) -> dict:
+        """Parses a rule's YAML once per edit. Callers get their own copy, as the engine may modify the rule."""
+        # Runners live for the whole process (see get_runner), so an edited YAML must not keep serving the old rule.
+        stamp = (rule_yml, self._mtime_ns(rule_yml))
+        cached = self._rule_cache.get(rule_id)
+        if not cached or cached[0] != stamp:
+            import yaml
+
+            with open(rule_yml, "r", encoding="utf-8") as f:
+                cached = self._rule_cache[rule_id] = (stamp, yaml.safe_load(f))
+        return copy.deepcopy(cached[1])
 
     @staticmethod
     def _rule_applicable_to_case(rule_id: str, data_path: str) -> bool:
@@ -478,7 +605,7 @@ class TestRunner:
         if not self._rule_applicable_to_case(rule_id, case_info["data_path"]):
             return {"case_id": case_id, "passed": True, "omitted": True, "total_errors": None, "expected": expected, "results_path": "N/A"}
 
-        _, results_data = self.run_validation(rule_id, case_info)
+        _, results_data, total_errors = self.run_validation(rule_id, case_info)
 
         if results_data is None or results_data.get("error"):
             results_path = ResultReporter.save_case_results(self.rules_dir, rule_id, test_type, case_id, results_data or {"error": "Unknown", "exception": "Engine returned None"}, self.version_info)
@@ -497,8 +624,7 @@ class TestRunner:
                 if unhighlighted_validations: results_data["unhighlighted_validations"] = unhighlighted_validations
                 if unvalidated_highlights: results_data["unvalidated_highlights"] = unvalidated_highlights
 
-        results_path = ResultReporter.save_case_results(self.rules_dir, rule_id, test_type, case_id, results_data, self.version_info)
-        total_errors = sum(len(ds.get("errors", [])) for ds in results_data.get("datasets", []))
+        results_path = ResultReporter.save_case_results(self.rules_dir, rule_id, test_type, case_id, results_data, self.version_info, total_errors)
         passed = (total_errors == 0) if test_type == "positive" else (total_errors > 0)
 
         return {"case_id": case_id, "passed": passed, "total_errors": total_errors, "expected": expected, "results_path": results_path}
@@ -515,32 +641,48 @@ class TestRunner:
 
             rule_id_idx = headers.index("Rule ID") if "Rule ID" in headers else -1
             error_group_idx = headers.index("Error group") if "Error group" in headers else -1
+            col_idx = self._validation_column_indices(headers)
 
             for row in reader:
                 if not row or not any(row): continue
                 r_id = row[rule_id_idx].strip() if rule_id_idx != -1 and len(row) > rule_id_idx else None
                 e_id = row[error_group_idx].strip() if error_group_idx != -1 and len(row) > error_group_idx else "1"
                 if len(row) == len(headers):
-                    validation_values.setdefault(r_id, {}).setdefault(e_id, []).append(dict(zip(headers, row)))
+                    validation_values.setdefault(r_id, {}).setdefault(e_id, []).append(self._to_validation_row(row, col_idx))
         return validation_values
 
     def get_validation_info_xlsx(self, data_path: str):
-        xl_path = list(Path(data_path).glob("[!~]*.xls*"))[0]
-        wb = op.load_workbook(xl_path, data_only=True)
+        xl_path = find_files(Path(data_path), *EXCEL_EXTENSIONS)[0]
+        # Only the Validation sheet's values are needed, so stream it rather than materialising every sheet and style.
+        wb = op.load_workbook(xl_path, data_only=True, read_only=True, keep_links=False)
         validation_values = {}
-        if "Validation" in wb.sheetnames:
-            ws = wb["Validation"]
-            headers = [cell.value for cell in ws[1]][1:]
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if row[0] is None: continue
-                validation_values.setdefault(None, {}).setdefault(row[0], []).append(dict(zip(headers, row[1:])))
+        try:
+            if "Validation" in wb.sheetnames:
+                rows = wb["Validation"].iter_rows(values_only=True)
+                # Offset by one so indices address the full row, whose first cell is the error group.
+                col_idx = [i + 1 if i is not None else None for i in self._validation_column_indices(list(next(rows, ()))[1:])]
+                for row in rows:
+                    if not row or row[0] is None: continue
+                    validation_values.setdefault(None, {}).setdefault(row[0], []).append(self._to_validation_row(row, col_idx))
+        finally:
+            wb.close()
         return validation_values
 
+    @staticmethod
+    def _validation_column_indices(headers: Sequence) -> List[Optional[int]]:
+        """Resolves the position of each of VALIDATION_COLUMNS in a header row once per sheet."""
+        return [headers.index(col) if col in headers else None for col in VALIDATION_COLUMNS]
+
+    @staticmethod
+    def _to_validation_row(row: Sequence, col_idx: List[Optional[int]]) -> ValidationRow:
+        sheet, error_level, row_num, variable, error_value = (row[i] if i is not None and i < len(row) else None for i in col_idx)
+        return ValidationRow(sheet, error_level or "Record", row_num, variable, error_value)
+
     def get_excel_highlights(self, data_path: str):
-        xl_path = list(Path(data_path).glob("[!~]*.xls*"))[0]
+        xl_path = find_files(Path(data_path), *EXCEL_EXTENSIONS)[0]
         highlighted_cells = {}
         YELLOW_INDICES = (5, 11, 13, 14, 34)
-        wb = op.load_workbook(xl_path, data_only=True)
+        wb = op.load_workbook(xl_path, data_only=True, keep_links=False)
         for sheet in wb.worksheets:
             for row in sheet.iter_rows():
                 for cell in row:
@@ -552,23 +694,32 @@ class TestRunner:
         return highlighted_cells
 
     def validate_errors(self, results_data: dict, validations: dict, rule_id: str = None):
-        unmatched = []
         rule_validations = validations.get(rule_id.split("/")[-1] if rule_id else None, validations.get(None, {}))
-        
+
+        datasets = results_data.get("datasets", [])
+        if not any(not error_obj.get("error") for ds in datasets for error_obj in ds.get("errors", [])):
+            unmatched = [{"value": {e.variable: e.error_value for e in entries}} for entries in rule_validations.values() if entries]
+            return results_data, unmatched
+
         flat_validation = {}
         for idx, entries in rule_validations.items():
             if not entries: continue
-            error_level = entries[0].get("Error level", "Record").lower()
-            sheet = entries[0]["Sheet"]
-            row = 1 if str(entries[0]["Row num"]).lower() in ["1", "n/a"] else int(entries[0]["Row num"]) - 4
-            flat_validation[(sheet, error_level, row, idx)] = {e["Variable"]: e["Error value"] for e in entries}
-
-        for ds in results_data.get("datasets", []):
+            error_level = entries[0].error_level.lower()
+            sheet = entries[0].sheet
+            row = 1 if str(entries[0].row_num).lower() in ["1", "n/a"] else int(entries[0].row_num) - 4
+            flat_validation[(sheet, error_level, row, idx)] = {e.variable: e.error_value for e in entries}
+
+        # Matched validation groups are marked rather than deleted so the index is never mutated mid-iteration.
+        consumed = set()
+        for ds in datasets:
+            if not ds.get("errors"): continue
             sheet_name = ds["dataset"].split(".")[0].lower() if rule_id else ds["dataset"]
-            for error_obj in ds.get("errors", []):
+            for error_obj in ds["errors"]:
                 if not error_obj.get("error"):
                     match_found = False
-                    for (v_sheet, v_error_level, v_row, v_idx), v_values in flat_validation.items():
+                    for key, v_values in flat_validation.items():
+                        if key in consumed: continue
+                        v_sheet = key[0]
                         if v_sheet.split(".")[0].lower() == ds["dataset"].split(".")[0].lower():
                             v_not_absent = set(k for k, v in v_values.items() if v != "[ABSENT]")
                             res_not_absent = set(k for k, v in error_obj["value"].items() if v != "[ABSENT]") - set(k for k, v in v_values.items() if v == "[ABSENT]")
@@ -576,34 +727,33 @@ class TestRunner:
                                 match_found = True
                             if match_found:
                                 error_obj["validated"] = True
-                                del flat_validation[(v_sheet, v_error_level, v_row, v_idx)]
+                                consumed.add(key)
                                 break
                     if not match_found: error_obj["validated"] = False
 
-        for _, values in flat_validation.items():
-            unmatched.append({"value": dict(values)})
+        unmatched = [{"value": dict(values)} for key, values in flat_validation.items() if key not in consumed]
         return results_data, unmatched
 
     def check_highlights(self, validations: dict, highlights: dict):
-        unmatched_validations, unmatched_highlights, matched_highlights = [], [], set()
-        
+        unmatched_validations, matched_highlights = [], set()
+
+        # Flatten once so each validation entry costs a single hash lookup; insertion order is kept for reporting.
+        highlight_values = {(sheet, row_num, var): val for sheet, rows in highlights.items() for row_num, vals in rows.items() for var, val in vals.items()}
+
         for v_entries in validations.get(None, {}).values():
             for e in v_entries:
-                sheet, error_level, row, var, error_val = e["Sheet"], e["Error level"].lower(), e["Row num"], e["Variable"], e["Error value"]
+                sheet, error_level, row, var, error_val = e.sheet, e.error_level.lower(), e.row_num, e.variable, e.error_value
                 if str(var)[0] == "$": continue
                 var = var.split(".")[-1] if "." in str(var) else var
+                key = (sheet, row, var)
                 if error_level == "record" and error_val != "[ABSENT]":
-                    if str(highlights.get(sheet, {}).get(row, {}).get(var)) == str(error_val): matched_highlights.add((sheet, row, var))
+                    if str(highlight_values.get(key)) == str(error_val): matched_highlights.add(key)
                     else: unmatched_validations.append({None: [sheet, error_level, row, var, error_val]})
                 elif error_level == "variable" and error_val == "[PRESENT]":
-                    if var in highlights.get(sheet, {}).get(row, {}): matched_highlights.add((sheet, row, var))
+                    if key in highlight_values: matched_highlights.add(key)
                     else: unmatched_validations.append({None: [sheet, error_level, row, var, error_val]})
 
-        for sheet, rows in highlights.items():
-            for row_num, vals in rows.items():
-                for var in vals.keys():
-                    if (sheet, row_num, var) not in matched_highlights:
-                        unmatched_highlights.append({"Sheet": sheet, "Row": row_num, "Variable": var})
+        unmatched_highlights = [{"Sheet": sheet, "Row": row_num, "Variable": var} for sheet, row_num, var in highlight_values if (sheet, row_num, var) not in matched_highlights]
 
         return unmatched_validations, unmatched_highlights
 
@@ -632,6 +782,14 @@ class TestRunner:
 
         return summary
 
+    def close(self):
+        """Releases the data service's database connection once all rules have run."""
+        # Best effort: the connection belongs to the engine's shared data service singleton.
+        try:
+            self.data_service.pgi.close()
+        except Exception:
+            pass
+
 
 class InteractiveHandler:
     """Handles user prompts for interactive mode."""
@@ -639,9 +797,10 @@ class InteractiveHandler:
     @staticmethod
     def prompt_rule(available: List[str]) -> str:
         print("\nWhich rule would you like to test?")
+        known = set(available)
         while True:
             choice = input("Enter rule ID (e.g. CORE-000215): ").strip()
-            if choice in available: return choice
+            if choice in known: return choice
             print(f"Invalid. Available: {', '.join(available[:5])}...")
 
     @staticmethod
@@ -649,12 +808,13 @@ class InteractiveHandler:
         print("\nTest specific case? (Leave blank for all)")
         flat_list = [f"{t_type}/{c['case_id']}" for t_type in ["positive", "negative"] for c in available[t_type]]
         if not flat_list: return None
+        known = set(flat_list)
 
         for i, tc in enumerate(flat_list, 1): print(f"  {i}. {tc}")
         while True:
             choice = input("\nEnter case (e.g., positive/01, number, or Enter): ").strip()
             if not choice: return None
-            if choice in flat_list: return choice
+            if choice in known: return choice
             if choice.isdigit() and 0 <= int(choice) - 1 < len(flat_list): return flat_list[int(choice) - 1]
             print("Invalid choice.")
 
@@ -710,6 +870,7 @@ def main():
         if len(rules_to_run) == 1:
             print(f"\nRunning {rules_to_run[0]}...")
             summary = runner.run_rule_suite(rules_to_run[0], specific_case)
+            runner.close()
             ResultReporter.display_rule_summary(summary, verbose=args.verbose)
             sys.exit(0 if summary["status"] == "passed" else 1)
 
@@ -719,18 +880,24 @@ def main():
 
     results = {"passed": [], "failed": [], "error": []}
     total = len(rules_to_run)
-    print("Core SQL Rules Engine - Test Suite\n" + "=" * 60)
+    print("Core SQL Rules Engine - Test Suite\n" + SUMMARY_RULE)
+
+    # Redraw a single progress line on a terminal; when piped (e.g. CI logs) emit one line per rule and flush less often.
+    is_tty = sys.stdout.isatty()
+    flush_every = 4 if is_tty else 8
 
     for i, rule_id in enumerate(rules_to_run, 1):
-        sys.stdout.write(f"\r[{i}/{total}] Testing {rule_id}...")
-        sys.stdout.flush()
+        flush = i % flush_every == 0 or i == total
+        if is_tty: print(f"\r[{i}/{total}] Testing {rule_id}...", end="", flush=flush)
+        else: print(f"[{i}/{total}] Testing {rule_id}...", flush=flush)
         summary = runner.run_rule_suite(rule_id)
         if any(t.get("error") for t in summary["positive_tests"] + summary["negative_tests"]): results["error"].append(summary)
         elif summary["status"] == "passed": results["passed"].append(summary)
         else: results["failed"].append(summary)
 
+    runner.close()
     sys.stdout.write("\n\n")
-    print("=" * 60 + "\nFINAL SUMMARY\n" + "=" * 60)
+    print(SUMMARY_RULE + "\nFINAL SUMMARY\n" + SUMMARY_RULE)
     print(f"Total: {total} | Passed: {len(results['passed'])} | Failed: {len(results['failed'])} | Errors: {len(results['error'])}")
 
     if results["failed"]:
@@ -753,13 +920,36 @@ def main():
     sys.exit(1 if results["failed"] or results["error"] else 0)
 
 
+@functools.lru_cache(maxsize=None)
+def get_runner(
+    standard: str,
+    use_pgserver: bool = True,
+    unii_path: Optional[str] = None,
+    medrt_path: Optional[str] = None,
+    loinc_path: Optional[str] = None,
+    snomed_path: Optional[str] = None,
+) -> TestRunner:
+    """Returns a TestRunner shared by every caller in this process with the same configuration."""
+    # Runners share the engine's process-wide data service singleton and its connection, which fork() would hand
+    # to a child as-is. Any process pool must therefore use the "spawn" start method, so each worker opens its own.
+    # Unbounded: there are only a handful of configurations, and a runner is never dropped with its resources still open.
+    return TestRunner(
+        standard=standard,
+        use_pgserver=use_pgserver,
+        unii_path=unii_path,
+        medrt_path=medrt_path,
+        loinc_path=loinc_path,
+        snomed_path=snomed_path,
+    )
+
+
 def generate_rule_results(standard: str, rules_dir: str, rule_id: str) -> dict:
-    rule_yml = list((Path(rules_dir) / rule_id).glob("[!~]*.yml"))[0]
+    rule_yml = find_files(Path(rules_dir) / rule_id, ".yml")[0]
     with rule_yml.open("r", encoding="utf-8") as f:
         content = f.read().lower()
     
-    return TestRunner(
-        standard=standard,
+    return get_runner(
+        standard,
         unii_path="dummy_ex_dicts/unii" if "unii" in content else None,
         medrt_path="dummy_ex_dicts/medrt" if "medrt" in content else None,
         loinc_path="dummy_ex_dicts/loinc" if "loinc" in content else None,
@@ -1,13 +1,32 @@
 from copy import copy
+import json
+import os
 import sys
 import argparse
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
+from xml.etree import ElementTree
 import openpyxl
 from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import column_index_from_string
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # Optional: a much faster reader for the label scan; openpyxl is used when it's missing.
+    CalamineWorkbook = None
 
 SDTM_RULES_DIR = Path("rules")
 ADAM_RULES_DIR = Path("adam_rules")
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+FORMAT_CACHE_FILE = Path(".formatter_cache.json")
+LABEL_CACHE_FILE = Path(".formatter_labels.json")
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+DOC_RELS_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
 
 BOLD_FONT = Font(bold=True)
 ITALIC_FONT = Font(italic=True)
@@ -33,98 +52,335 @@ VALIDATION_SHEET = {
 }
 
 
+def load_json_cache(cache_path: Path, version: int) -> dict:
+    """Returns a cache file's entries, or an empty dict if it is missing, unreadable or from another cache version."""
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data.get("version") == version:
+            return data["files"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_json_cache(cache_path: Path, version: int, entries: dict):
+    """Writes a cache file via a temporary file and os.replace, so an interrupted run never leaves it half-written."""
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        tmp_path.write_text(json.dumps({"version": version, "files": entries}), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write cache {cache_path}: {e}")
+
+
 class FileManager:
     """Handles discovery of test case files."""
 
     @staticmethod
     def get_all_test_cases(rules_dir: Path) -> List[dict]:
         """Returns a flat list of all test cases across all rules."""
-        if not rules_dir.exists():
-            return []
-
         cases = []
-        rule_dirs = sorted([d for d in rules_dir.iterdir() if d.is_dir() and (d.name.startswith("CORE-") or d.name.startswith("AD"))])
+        # scandir entries carry their file type, so telling directories apart costs no extra stat per entry.
+        rule_names = sorted(name for name in FileManager._subdirs(rules_dir) if name.startswith("CORE-") or name.startswith("AD"))
 
-        for rule_path in rule_dirs:
+        for rule_name in rule_names:
+            rule_path = rules_dir / rule_name
             for test_type in ["positive", "negative"]:
                 type_dir = rule_path / test_type
-                if not type_dir.exists():
-                    continue
 
-                for case_dir in sorted(type_dir.iterdir()):
-                    if not case_dir.is_dir():
-                        continue
-
-                    data_dir = case_dir / "data"
-                    excel_files = list(data_dir.glob("[!~]*.xls*"))  # Ignore temp files
+                for case_name in sorted(FileManager._subdirs(type_dir)):
+                    excel_files = FileManager._find_excel(type_dir / case_name / "data")
 
                     if excel_files:
                         cases.append(
                             {
-                                "rule_id": rule_path.name,
-                                "case_id": case_dir.name,
+                                "rule_id": rule_name,
+                                "case_id": case_name,
                                 "type": test_type,
                                 "path": excel_files[0],
                             }
                         )
         return cases
 
+    @staticmethod
+    def _subdirs(directory: Path) -> List[str]:
+        """Names of a directory's subdirectories, or an empty list if it doesn't exist."""
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.name for entry in entries if entry.is_dir()]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    @staticmethod
+    def _find_excel(data_dir: Path) -> List[Path]:
+        """Lists workbooks in a single scandir pass, ignoring Office lock files (~$...)."""
+        try:
+            with os.scandir(data_dir) as entries:
+                return [
+                    Path(entry.path)
+                    for entry in entries
+                    if not entry.name.startswith("~") and os.path.splitext(entry.name)[1].lower() in EXCEL_EXTENSIONS and entry.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
 
 class LabelManager:
     """Scrapes existing sheets to build a global map of Filename -> Label."""
 
-    def __init__(self):
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_path: Optional[Path] = LABEL_CACHE_FILE):
         self.label_map: Dict[str, str] = {}
+        self.cache_path = cache_path
+        self.cache_entries: Dict[str, dict] = {}
 
     def scan_all_files(self, cases: List[dict]):
         print("Scanning files to build label map...")
-        for case in cases:
-            self._scan_file(case["path"])
-        print(f"Map built. Found {len(self.label_map)} unique labels.")
+        paths = [case["path"] for case in cases]
+
+        # Each file's labels are cached against its mtime and size, so only files changed since the last run are read.
+        entries = load_json_cache(self.cache_path, self.CACHE_VERSION) if self.cache_path else {}
+        stale = []
+        for path in paths:
+            stamp = self._stamp(path)
+            entry = entries.get(str(path))
+            if not (stamp and entry and entry["stamp"] == stamp):
+                stale.append((path, stamp))
+
+        if stale:
+            # Scans are dominated by zip inflation and file I/O, which release the GIL, so threads overlap well.
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4, len(stale))) as executor:
+                for (path, stamp), labels in zip(stale, executor.map(self._scan_file, [p for p, _ in stale])):
+                    entries[str(path)] = {"stamp": stamp, "labels": labels}
+
+        # Merging in input order keeps "last file wins" as before.
+        for path in paths:
+            self.label_map.update(entries[str(path)]["labels"])
+
+        # Files outside this run, e.g. the other standard's rules, keep their entries; only deleted files are dropped.
+        scanned = {str(path) for path in paths}
+        self.cache_entries = {key: entry for key, entry in entries.items() if key in scanned or os.path.exists(key)}
+        self.save_cache()
+        print(f"Map built. Found {len(self.label_map)} unique labels ({len(stale)} of {len(paths)} files read).")
 
-    def _scan_file(self, path: Path):
+    @staticmethod
+    def _stamp(path: Path) -> Optional[List[int]]:
         try:
-            wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-            if "Datasets" in wb.sheetnames:
-                ws = wb["Datasets"]
-                for row in ws.iter_rows(min_row=2, max_col=2, values_only=True):
-                    if row and len(row) >= 2 and row[0] and row[1]:
-                        self.label_map[str(row[0])] = str(row[1])
-            wb.close()
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def _scan_file(path: Path) -> Dict[str, str]:
+        labels = {}
+        try:
+            for row in LabelManager._read_datasets_rows(path):
+                if row and len(row) >= 2 and row[0] and row[1]:
+                    labels[LabelManager._cell_text(row[0])] = LabelManager._cell_text(row[1])
         except Exception:
             pass
+        return labels
+
+    @staticmethod
+    def _read_datasets_rows(path: Path) -> List[tuple]:
+        """Returns the Datasets sheet's rows below the header, or an empty list if the sheet is missing."""
+        readers = [LabelManager._read_rows_calamine] if CalamineWorkbook is not None else []
+        for reader in readers + [LabelManager._read_rows_xml]:
+            try:
+                return reader(path)
+            except Exception:
+                pass  # A file one reader can't parse may still open with the next, ending with openpyxl.
+
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+        try:
+            if "Datasets" not in wb.sheetnames:
+                return []
+            return list(wb["Datasets"].iter_rows(min_row=2, max_col=2, values_only=True))
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _read_rows_calamine(path: Path) -> List[tuple]:
+        wb = CalamineWorkbook.from_path(str(path))
+        if "Datasets" not in wb.sheet_names:
+            return []
+        # Keep empty leading rows so row 1 is always the header, as with openpyxl's min_row=2.
+        return [tuple(row[:2]) for row in wb.get_sheet_by_name("Datasets").to_python(skip_empty_area=False)[1:]]
+
+    @staticmethod
+    def _read_rows_xml(path: Path) -> List[tuple]:
+        """Reads columns A and B of the Datasets sheet straight from the xlsx package, parsing only that sheet."""
+        with zipfile.ZipFile(path) as z:
+            workbook = ElementTree.fromstring(z.read("xl/workbook.xml"))
+            if workbook.tag != f"{SHEET_NS}workbook":
+                raise ValueError(f"Unsupported workbook namespace in {path}")
+
+            sheet = next((s for s in workbook.iter(f"{SHEET_NS}sheet") if s.get("name") == "Datasets"), None)
+            if sheet is None:
+                return []
+
+            rels = list(ElementTree.fromstring(z.read("xl/_rels/workbook.xml.rels")).iter(f"{RELS_NS}Relationship"))
+            sheet_part = next(LabelManager._zip_part(rel) for rel in rels if rel.get("Id") == sheet.get(f"{DOC_RELS_NS}id"))
+
+            shared_strings = []
+            for rel in rels:
+                if rel.get("Type", "").endswith("/sharedStrings"):
+                    root = ElementTree.fromstring(z.read(LabelManager._zip_part(rel)))
+                    shared_strings = [LabelManager._xml_text(si).replace("x005F_", "") for si in root.iter(f"{SHEET_NS}si")]
+
+            rows = []
+            row_num = 0
+            with z.open(sheet_part) as sheet_xml:
+                for _, element in ElementTree.iterparse(sheet_xml):
+                    if element.tag != f"{SHEET_NS}row":
+                        continue
+                    row_num = int(element.get("r", row_num + 1))
+                    if row_num > 1:
+                        rows.extend([(None, None)] * (row_num - 2 - len(rows)))
+                        rows.append(LabelManager._xml_row_values(element, shared_strings))
+                    element.clear()
+            return rows
+
+    @staticmethod
+    def _xml_row_values(row, shared_strings: List[str]) -> tuple:
+        """Decodes the first two cells of a sheet row the way openpyxl reports them (dates aside, which stay numbers)."""
+        values = [None, None]
+        col = 0
+        for cell in row.iter(f"{SHEET_NS}c"):
+            ref = cell.get("r")
+            col = column_index_from_string(ref.rstrip("0123456789")) if ref else col + 1
+            if col > 2:
+                continue
+
+            data_type = cell.get("t", "n")
+            if data_type == "inlineStr":
+                inline = cell.find(f"{SHEET_NS}is")
+                value = LabelManager._xml_text(inline) if inline is not None else None
+            else:
+                value = cell.findtext(f"{SHEET_NS}v") or None
+                if value is not None:
+                    if data_type == "n":
+                        value = float(value) if "." in value or "E" in value or "e" in value else int(value)
+                    elif data_type == "s":
+                        value = shared_strings[int(value)]
+                    elif data_type == "b":
+                        value = bool(int(value))
+            values[col - 1] = value
+        return tuple(values)
+
+    @staticmethod
+    def _zip_part(rel) -> str:
+        """Resolves a workbook relationship target to its path inside the package."""
+        target = rel.get("Target")
+        return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+    @staticmethod
+    def _xml_text(node) -> str:
+        """Joins a string item's plain text and rich-text runs, leaving out phonetic hints."""
+        return "".join(t.text or "" for t in node.findall(f"{SHEET_NS}t") + node.findall(f"{SHEET_NS}r/{SHEET_NS}t"))
+
+    @staticmethod
+    def _cell_text(value) -> str:
+        # calamine reports every number as a float; match openpyxl, which returns whole numbers as ints.
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
 
     def get_label(self, filename: str) -> str:
         return self.label_map.get(filename, "Unknown")
 
+    def record(self, file_path: Path, xpt_sheets: List[str]):
+        """Refreshes a file's cache entry once formatting has written its Datasets sheet, so the next scan can skip it."""
+        stamp = self._stamp(file_path)
+        if stamp:
+            labels = {sheet: self.get_label(sheet) for sheet in xpt_sheets}
+            self.cache_entries[str(file_path)] = {"stamp": stamp, "labels": labels}
+
+    def save_cache(self):
+        if self.cache_path:
+            save_json_cache(self.cache_path, self.CACHE_VERSION, self.cache_entries)
+
+
+class FormatCache:
+    """Remembers each formatted file's mtime, size and Datasets labels so unchanged files can be skipped on later runs."""
+
+    VERSION = 1
+
+    def __init__(self, cache_path: Path = FORMAT_CACHE_FILE):
+        self.cache_path = cache_path
+        self.entries: Dict[str, dict] = load_json_cache(cache_path, self.VERSION)
+
+    def is_current(self, file_path: Path, label_manager: "LabelManager") -> bool:
+        """True if the file is untouched since it was last formatted and its dataset labels haven't changed."""
+        return self.is_formatted(file_path) and all(
+            label_manager.get_label(sheet) == label for sheet, label in self.entries[str(file_path)]["labels"].items()
+        )
+
+    def is_formatted(self, file_path: Path) -> bool:
+        """True if the file is untouched since this formatter last wrote it, i.e. it is already sanitised."""
+        entry = self.entries.get(str(file_path))
+        if not entry:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+
+    def record(self, file_path: Path, xpt_sheets: List[str], label_manager: "LabelManager"):
+        stat = os.stat(file_path)
+        labels = {sheet: label_manager.get_label(sheet) for sheet in xpt_sheets}
+        self.entries[str(file_path)] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "labels": labels}
+
+    def save(self):
+        save_json_cache(self.cache_path, self.VERSION, self.entries)
+
 
 class Formatter:
     """
     Orchestrates the formatting of a single Excel file.
     """
 
-    def __init__(self, file_path: Path, label_manager: LabelManager):
+    def __init__(self, file_path: Path, label_manager: LabelManager, sanitised: bool = False):
         self.file_path = file_path
         self.label_manager = label_manager
+        # Set when the file was last written by this formatter, so only formatting changes make a save necessary.
+        self.sanitised = sanitised
         self.wb: Optional[openpyxl.Workbook] = None
+        self.xpt_sheets: List[str] = []
         self.is_negative = self.file_path.parents[2].name == "negative"
 
     def format(self) -> bool:
         """Main execution flow."""
         try:
-            self.wb = openpyxl.load_workbook(self.file_path)
+            self.wb = openpyxl.load_workbook(self.file_path, keep_links=False)
+            before = self._snapshot() if self.sanitised else None
+            # Found once for both the Datasets rows and the styling; reordering the standard tabs keeps their order.
+            self.xpt_sheets = [name for name in self.wb.sheetnames if name.lower().endswith(".xpt")]
 
             self._ensure_sheets()
             self._populate_sheets()
             self._style_sheets()
 
-            self.wb.save(self.file_path)
+            # Sanitise from memory so the file is written once, rather than saved here and re-read by the Sanitiser.
+            # An already sanitised file that formatting left untouched is not rewritten at all.
+            if before is None or self._snapshot() != before:
+                Sanitiser.rebuild(self.wb).save(self.file_path)
             self.wb.close()
             return True
         except Exception as e:
             print(f"Failed to format {self.file_path}: {e}")
             return False
 
+    def _snapshot(self) -> tuple:
+        """Sheet order plus each non-blank cell's value and style array, read without creating any cells."""
+        return tuple(self.wb.sheetnames), [
+            {coord: (cell.value, tuple(cell._style) if cell.has_style else ()) for coord, cell in ws._cells.items() if cell.value is not None or cell.has_style}
+            for ws in self.wb.worksheets
+        ]
+
     def _ensure_sheets(self):
         """Creates missing sheets and orders tabs."""
         self._ensure_sheet_exists(LIBRARY_SHEET["name"], LIBRARY_SHEET["index"])
@@ -156,21 +412,22 @@ class Formatter:
             ws.cell(row=1, column=col_idx, value=header)
 
         for cell_coord, value in LIBRARY_SHEET["defaults"].items():
-            if not ws[cell_coord].value:
-                ws[cell_coord] = value
+            cell = ws[cell_coord]
+            if not cell.value:
+                cell.value = value
 
     def _populate_datasets(self):
-        ws = self.wb[DATASETS_SHEET["name"]]
-
-        ws.delete_rows(1, ws.max_row)
-
-        ws.append(DATASETS_SHEET["headers"])
+        rows = [DATASETS_SHEET["headers"]] + [[sheet_name, self.label_manager.get_label(sheet_name)] for sheet_name in self.xpt_sheets]
 
-        xpt_sheets = [s for s in self.wb.sheetnames if s.lower().endswith(".xpt")]
+        # The sheet is rebuilt from scratch, so swapping in an empty one at the same position is cheaper than delete_rows,
+        # which shifts every remaining cell. Nothing else on the sheet survives the save's rebuild anyway.
+        old_ws = self.wb[DATASETS_SHEET["name"]]
+        index = self.wb.index(old_ws)
+        self.wb.remove(old_ws)
+        ws = self.wb.create_sheet(DATASETS_SHEET["name"], index)
 
-        for sheet_name in xpt_sheets:
-            label = self.label_manager.get_label(sheet_name)
-            ws.append([sheet_name, label])
+        for row in rows:
+            ws.append(row)
 
     def _populate_validation(self):
         ws = self.wb[VALIDATION_SHEET["name"]]
@@ -179,39 +436,46 @@ class Formatter:
                 ws.cell(row=1, column=col_idx, value=header)
 
     def _style_sheets(self):
-        self._style_standard_sheet(LIBRARY_SHEET["name"])
-        self._style_standard_sheet(DATASETS_SHEET["name"])
+        # Source style array -> restyled array, one map per look. Sheets share a handful of styles, so the font and fill
+        # setters run once per distinct style and every other cell is just assigned the resulting array.
+        header_styles, metadata_styles = {}, {}
+
+        self._style_standard_sheet(LIBRARY_SHEET["name"], header_styles)
+        self._style_standard_sheet(DATASETS_SHEET["name"], header_styles)
 
         if self.is_negative:
-            self._style_standard_sheet(VALIDATION_SHEET["name"])
+            self._style_standard_sheet(VALIDATION_SHEET["name"], header_styles)
 
-        self._style_xpt_sheets()
+        self._style_xpt_sheets(header_styles, metadata_styles)
 
-    def _style_standard_sheet(self, sheet_name: str):
+    def _style_standard_sheet(self, sheet_name: str, header_styles: dict):
         """Applies Bold Header style to a standard sheet."""
         if sheet_name not in self.wb.sheetnames:
             return
 
-        ws = self.wb[sheet_name]
-        for cell in ws[1]:
-            cell.font = BOLD_FONT
+        self._restyle(self.wb[sheet_name][1], header_styles, BOLD_FONT)
 
-    def _style_xpt_sheets(self):
+    def _style_xpt_sheets(self, header_styles: dict, metadata_styles: dict):
         """Applies specific styling rules to .xpt sheets."""
-        for sheet_name in self.wb.sheetnames:
-            if not sheet_name.lower().endswith(".xpt"):
-                continue
-
+        for sheet_name in self.xpt_sheets:
             ws = self.wb[sheet_name]
+            self._restyle(ws[1], header_styles, BOLD_FONT)
 
-            for cell in ws[1]:
-                cell.font = BOLD_FONT
+            for row in ws.iter_rows(min_row=2, max_row=4, max_col=ws.max_column):
+                self._restyle(row, metadata_styles, ITALIC_FONT, LIGHT_FILL)
 
-            for row_idx in range(2, 5):
-                for col_idx in range(1, ws.max_column + 1):
-                    cell = ws.cell(row=row_idx, column=col_idx)
-                    cell.fill = LIGHT_FILL
-                    cell.font = ITALIC_FONT
+    @staticmethod
+    def _restyle(cells, restyled: dict, font: Font, fill: Optional[PatternFill] = None):
+        """Sets the font (and fill) on each cell, keeping its other style attributes."""
+        for cell in cells:
+            style_key = tuple(cell._style or ())
+            if style_key in restyled:
+                cell._style = copy(restyled[style_key])
+            else:
+                if fill is not None:
+                    cell.fill = fill
+                cell.font = font
+                restyled[style_key] = copy(cell._style)
 
 
 class Sanitiser:
@@ -219,29 +483,57 @@ class Sanitiser:
     def sanitize_xlsx(file_path: str):
         path = Path(file_path)
         try:
-            old_wb = openpyxl.load_workbook(path)
-
-            new_wb = openpyxl.Workbook()
-            new_wb.remove(new_wb.active)
-
-            for sheet_name in old_wb.sheetnames:
-                source = old_wb[sheet_name]
-                target = new_wb.create_sheet(title=sheet_name)
+            Sanitiser.rebuild(openpyxl.load_workbook(path, keep_links=False)).save(path)
+        except Exception as e:
+            print(f"Error sanitizing {path.name}: {e}")
 
-                for row in source.iter_rows():
-                    for cell in row:
-                        new_cell = target.cell(row=cell.row, column=cell.column, value=cell.value)
-                        if cell.has_style:
+    @staticmethod
+    def rebuild(old_wb: openpyxl.Workbook) -> openpyxl.Workbook:
+        """Copies cell values and basic styles into a fresh workbook, leaving everything else behind."""
+        new_wb = openpyxl.Workbook()
+        new_wb.remove(new_wb.active)
+
+        # Source style array -> equivalent style array in new_wb. Test files reuse a handful of styles, so each
+        # is translated once and then assigned directly instead of copying five style objects for every cell.
+        style_map = {}
+
+        for sheet_name in old_wb.sheetnames:
+            source = old_wb[sheet_name]
+            target = new_wb.create_sheet(title=sheet_name)
+
+            for row in source.iter_rows():
+                for cell in row:
+                    new_cell = target.cell(row=cell.row, column=cell.column, value=cell.value)
+                    if cell.has_style:
+                        style_key = tuple(cell._style)
+                        if style_key not in style_map:
                             new_cell.font = copy(cell.font)
                             new_cell.border = copy(cell.border)
                             new_cell.fill = copy(cell.fill)
                             new_cell.number_format = copy(cell.number_format)
                             new_cell.alignment = copy(cell.alignment)
+                            style_map[style_key] = new_cell._style
+                        else:
+                            new_cell._style = copy(style_map[style_key])
 
-            new_wb.save(path)
+        return new_wb
+
+
+_WORKER_LABELS: Optional[LabelManager] = None
+
+
+def _init_format_worker(label_map: Dict[str, str]):
+    global _WORKER_LABELS
+    _WORKER_LABELS = LabelManager()
+    _WORKER_LABELS.label_map = label_map
 
-        except Exception as e:
-            print(f"Error sanitizing {path.name}: {e}")
+
+def format_case(path: Path, sanitised: bool = False, label_manager: Optional[LabelManager] = None) -> Tuple[bool, List[str]]:
+    """Formats one workbook and returns whether it succeeded along with its xpt sheet names. Workers use their own label map."""
+    formatter = Formatter(path, label_manager or _WORKER_LABELS, sanitised)
+    if not formatter.format():
+        return False, []
+    return True, formatter.xpt_sheets
 
 
 class InteractiveHandler:
@@ -268,6 +560,8 @@ def parse_arguments():
     parser.add_argument("-r", "--rule", type=str, help="Rule ID (e.g., CORE-000123)")
     parser.add_argument("-tc", "--testcase", type=str, help="Test case sub-path (e.g., negative/01). Requires -r.")
     parser.add_argument("-all", "--all", action="store_true", help="Run on all test cases in all rules.")
+    parser.add_argument("-f", "--force", action="store_true", help="Reformat files even if unchanged since the last run.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes used to format files.")
 
     args = parser.parse_args()
 
@@ -330,20 +624,45 @@ def main():
         sys.exit(0)
 
     total_cases = len(selected_cases)
-    print(f"Processing {total_cases} files...")
-    success_count = 0
-
-    for i, case in enumerate(selected_cases, 1):
-        case_id_str = f"{case['rule_id']}/{case['type']}/{case['case_id']}"
-        print(f"\r\033[K[{i}/{total_cases}] Processing: {case_id_str}", end="", flush=True)
-
-        formatter = Formatter(case["path"], label_mgr)
-        if formatter.format():
-            success_count += 1
+    format_cache = FormatCache()
+    to_format = [c for c in selected_cases if args.force or not format_cache.is_current(c["path"], label_mgr)]
+    unchanged_count = total_cases - len(to_format)
+    success_count = unchanged_count
+    print(f"Processing {len(to_format)} files ({unchanged_count} unchanged since the last run)...")
+
+    # Loading and saving workbooks is CPU-bound, so files are spread over processes; each receives the label map once.
+    pool = None
+    if args.jobs > 1 and len(to_format) > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=args.jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_format_worker,
+            initargs=(label_mgr.label_map,),
+        )
 
-        Sanitiser.sanitize_xlsx(case["path"])
-
-    print(f"\n\nComplete. {success_count}/{total_cases} formatted.")
+    try:
+        paths = [case["path"] for case in to_format]
+        sanitised = [format_cache.is_formatted(path) for path in paths]
+        if pool:
+            results = pool.map(format_case, paths, sanitised)
+        else:
+            results = (format_case(path, is_sanitised, label_mgr) for path, is_sanitised in zip(paths, sanitised))
+
+        for i, (case, (formatted, xpt_sheets)) in enumerate(zip(to_format, results), 1):
+            case_id_str = f"{case['rule_id']}/{case['type']}/{case['case_id']}"
+            print(f"\r\033[K[{i}/{len(to_format)}] Processed: {case_id_str}", end="", flush=True)
+
+            if formatted:
+                success_count += 1
+                format_cache.record(case["path"], xpt_sheets, label_mgr)
+                label_mgr.record(case["path"], xpt_sheets)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    format_cache.save()
+    label_mgr.save_cache()
+    print(f"\n\nComplete. {success_count}/{total_cases} formatted ({unchanged_count} already up to date).")
 
 
 if __name__ == "__main__":